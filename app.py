@@ -1,27 +1,58 @@
+import cProfile
+import csv
+import json
 import os
-from flask import Flask, render_template, request, redirect, url_for
+import random
+import re
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime, timezone
+from flask import (Flask, Blueprint, current_app, render_template, stream_template, request,
+                   redirect, url_for, jsonify, g, has_request_context, before_render_template,
+                   template_rendered)
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DataError, IntegrityError
+from werkzeug.http import is_resource_modified
 import click
 from flask.cli import with_appcontext
 
-# --- App Configuration ---
-# Create the Flask app instance. Explicitly defining the template_folder is a
-# robust practice for deployment environments like Render.
-app = Flask(__name__, template_folder='templates')
+# --- Extensions ---
+# The app itself is built by create_app() at the bottom of this file. The
+# extension and the blueprint holding the routes are created unbound here, so
+# importing this module is cheap: no app, engine or database work happens until
+# an app is created, and the schema is only checked once (see bootstrap_database).
+db = SQLAlchemy()
+bp = Blueprint('tasks', __name__)
 
-# A secret key is required by Flask to handle sessions and flash messages securely.
-app.config['SECRET_KEY'] = 'a-strong-and-random-secret-key' # In a real app, this should be a secure, random value.
+# SQLite is tuned for several gunicorn workers sharing one file: WAL lets readers
+# and a writer work concurrently, synchronous=NORMAL is safe under WAL and skips
+# most fsyncs, and busy_timeout makes writers wait for the lock instead of
+# failing with "database is locked". Each pragma can be overridden from the
+# environment (the benchmarks use this to compare against SQLite's defaults).
+SQLITE_PRAGMAS = {
+    'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+    'cache_size': int(os.environ.get('SQLITE_CACHE_SIZE', -16000)),  # negative = KiB
+}
 
-# --- Database Configuration ---
-# We will create the database in a dedicated 'instance' folder.
-# This is a standard Flask practice.
-instance_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance')
-os.makedirs(instance_path, exist_ok=True) # Ensure the folder exists before the app starts.
-app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(instance_path, 'tasks.db')}"
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-
-# Initialize the SQLAlchemy extension with our Flask app.
-db = SQLAlchemy(app)
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Applies SQLITE_PRAGMAS to every new SQLite connection."""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f'PRAGMA {name}={value}')
+    cursor.close()
 
 # --- Database Model ---
 # This class defines the structure of our 'task' table in the database.
@@ -33,67 +64,983 @@ class Task(db.Model):
     def __repr__(self):
         return f'<Task {self.id}>'
 
-# --- Self-Initializing Database ---
-# This block of code ensures the database tables are created automatically
-# when the application module is first loaded. This is a foolproof way to
-# initialize a database on platforms like Render.
-with app.app_context():
-    db.create_all()
+# --- Full-Text Search ---
+# On SQLite, task_fts is an FTS5 index over Task.content. It is an "external
+# content" table, so it stores only the index and reads the text from the task
+# table itself. Triggers keep it in sync with every INSERT/UPDATE/DELETE,
+# including the bulk statements issued by the batch API.
+SEARCH_INDEX_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS task_fts USING fts5(
+        content, content='task', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3')""",
+    """CREATE TRIGGER IF NOT EXISTS task_fts_insert AFTER INSERT ON task BEGIN
+        INSERT INTO task_fts(rowid, content) VALUES (new.id, new.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS task_fts_delete AFTER DELETE ON task BEGIN
+        INSERT INTO task_fts(task_fts, rowid, content) VALUES ('delete', old.id, old.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS task_fts_update AFTER UPDATE OF content ON task BEGIN
+        INSERT INTO task_fts(task_fts, rowid, content) VALUES ('delete', old.id, old.content);
+        INSERT INTO task_fts(rowid, content) VALUES (new.id, new.content);
+    END""",
+]
+
+def search_index_supported():
+    return db.engine.dialect.name == 'sqlite'
+
+def create_search_index():
+    """Creates the search index and its triggers. The index is filled from the
+    task table when it is new, or when its insert trigger was missing because a
+    bulk import suspended it (see suspend_search_index)."""
+    if not search_index_supported():
+        return
+    with db.engine.begin() as connection:
+        in_sync = connection.execute(text(
+            "SELECT count(*) FROM sqlite_master WHERE name IN ('task_fts', 'task_fts_insert')"
+        )).scalar() == 2
+        for statement in SEARCH_INDEX_DDL:
+            connection.execute(text(statement))
+        if not in_sync:
+            connection.execute(text("INSERT INTO task_fts(task_fts) VALUES ('rebuild')"))
+
+def suspend_search_index():
+    """Stops indexing new tasks one by one; create_search_index() catches up.
+
+    Bulk loads are several times faster with one rebuild at the end than with a
+    trigger firing per row. Should the load die part-way, the next bootstrap
+    (or import) notices the missing trigger and rebuilds the index.
+    """
+    if search_index_supported():
+        with db.engine.begin() as connection:
+            connection.execute(text('DROP TRIGGER IF EXISTS task_fts_insert'))
+
+def rebuild_search_index():
+    """Re-reads every task into the search index."""
+    with db.engine.begin() as connection:
+        connection.execute(text("INSERT INTO task_fts(task_fts) VALUES ('rebuild')"))
+
+def drop_search_index():
+    if search_index_supported():
+        with db.engine.begin() as connection:
+            connection.execute(text('DROP TABLE IF EXISTS task_fts'))
+
+def search_terms(query):
+    """Splits free text into words; punctuation never reaches the MATCH syntax."""
+    return re.findall(r'\w+', query)
+
+def fts_match_expression(terms):
+    # Every word must match; the last one also matches as a prefix, so results
+    # show up while the user is still typing it.
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+# --- Database Bootstrap ---
+# Creating the tables and the search index is a one-time step, not something
+# every import of this module pays for. `flask init-db` runs it explicitly;
+# under gunicorn, gunicorn.conf.py runs it once in the master before the workers
+# fork; anywhere else (e.g. `flask run`) it runs on a process's first request.
+_bootstrap_lock = threading.Lock()
+
+def bootstrap_database(app):
+    """Creates any missing tables and the search index, once per app."""
+    with _bootstrap_lock:
+        if app.extensions.get('tasks_bootstrapped'):
+            return
+        with app.app_context():
+            db.create_all()
+            create_search_index()
+            # A new deployment may render pages differently, so cached copies
+            # and browsers' ETags from before it are dropped.
+            with db.engine.begin() as connection:
+                invalidate_dashboard(connection)
+        app.extensions['tasks_bootstrapped'] = True
+
+def _bootstrap_on_first_request():
+    if not current_app.extensions.get('tasks_bootstrapped'):
+        bootstrap_database(current_app._get_current_object())
+
+# --- Task List Pagination ---
+# The dashboard is paginated by keyset on Task.id ("?after=<id>&limit=N") rather
+# than OFFSET, so every page costs the same no matter how deep into the table it is.
+TASKS_PER_PAGE = 50
+# Task.id is an INTEGER column: 64-bit on SQLite, but 32-bit on Postgres. Ids
+# are kept to the range that every supported database can store.
+MAX_TASK_ID = 2**31 - 1
+MAX_TASKS_PER_PAGE = 500
+TASK_FETCH_BATCH = 100
+
+class TaskPage:
+    """A lazily-fetched page of tasks, streamed from the database in batches.
+
+    Iterating yields at most `limit` tasks with an id greater than `after`.
+    Once iteration has finished, `last_id` and `has_more` describe where the
+    next page starts, so the template can render its "next page" link last.
+    """
+
+    def __init__(self, after, limit):
+        self.after = after
+        self.limit = limit
+        self.last_id = None
+        self.has_more = False
+
+    def __iter__(self):
+        # One extra row is fetched only to find out whether another page exists.
+        query = (Task.query.filter(Task.id > self.after)
+                 .order_by(Task.id)
+                 .limit(self.limit + 1)
+                 .yield_per(TASK_FETCH_BATCH))
+        for position, task in enumerate(query):
+            if position == self.limit:
+                self.has_more = True
+                break
+            self.last_id = task.id
+            yield task
+
+# --- Partial Responses ---
+# The dashboard's script toggles and deletes tasks in place. It marks its requests
+# with "X-Requested-With: fetch" and gets back only the changed row, so a click no
+# longer costs a redirect plus a re-render of the whole list. API clients can ask
+# for JSON instead; everyone else still gets the classic redirect.
+def _wants_json():
+    return request.accept_mimetypes.best == 'application/json'
+
+def _wants_fragment():
+    return request.headers.get('X-Requested-With') == 'fetch'
+
+# --- Response Cache ---
+# The dashboard is read far more often than it is written, so rendered pages are
+# cached. Every cache key embeds the current "dashboard version", a random token
+# kept in the database and replaced by every transaction that changes tasks, as
+# part of that same transaction. Old entries are then never looked up again and
+# simply age out. The token doubles as the pages' ETag.
+#
+# Because the version lives in the database, every gunicorn worker sees a change
+# as soon as it is committed, even though each worker keeps its own LRU cache of
+# pages. Set CACHE_REDIS_URL to share the rendered pages between workers as
+# well; CACHE_TTL=0 turns caching off.
+class LRUCache:
+    """A thread-safe in-process cache that evicts the least recently used entry
+    once it holds `max_entries`, and forgets entries after `ttl` seconds."""
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+class RedisCache:
+    """The same interface backed by Redis, shared by every worker. Requires the
+    optional `redis` package. Values are rendered pages, stored as UTF-8 text."""
+
+    def __init__(self, url, ttl, prefix='zenith-tasks:'):
+        import redis
+        self._client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self._client.get(self.prefix + key)
+        return None if value is None else value.decode()
+
+    def set(self, key, value):
+        if self.ttl > 0:
+            self._client.set(self.prefix + key, value.encode(), ex=self.ttl)
+
+CACHE_TTL = int(os.environ.get('CACHE_TTL', 5))
+if os.environ.get('CACHE_REDIS_URL'):
+    page_cache = RedisCache(os.environ['CACHE_REDIS_URL'], CACHE_TTL)
+else:
+    page_cache = LRUCache(int(os.environ.get('CACHE_MAX_ENTRIES', 256)), CACHE_TTL)
+
+# Per-process counters; "not_modified" counts requests answered with a 304.
+cache_stats = {'hit': 0, 'miss': 0, 'not_modified': 0}
+
+class DashboardVersion(db.Model):
+    """The single row holding the current dashboard version."""
+    __tablename__ = 'dashboard_version'
+    id = db.Column(db.Integer, primary_key=True)
+    token = db.Column(db.String(32), nullable=False)
+    modified = db.Column(db.Float, nullable=False)  # a Unix timestamp
+
+def dashboard_version():
+    """Returns the (token, last-modified timestamp) of the current task data."""
+    row = db.session.execute(
+        db.select(DashboardVersion.token, DashboardVersion.modified).where(DashboardVersion.id == 1)
+    ).first()
+    return tuple(row) if row else ('initial', 0.0)
+
+def invalidate_dashboard(connection):
+    """Replaces the dashboard version within `connection`'s transaction."""
+    version = {'token': uuid.uuid4().hex[:16], 'modified': time.time()}
+    table = DashboardVersion.__table__
+    if connection.execute(table.update().where(table.c.id == 1), version).rowcount == 0:
+        connection.execute(table.insert(), {'id': 1, **version})
+
+# Transactions that touch tasks replace the version as the last step before
+# they commit, so it changes if and only if their changes are committed. Doing
+# it last means the version row is locked after any task rows and only held
+# through the commit itself. Unit-of-work changes are seen at flush time, and
+# bulk INSERT/UPDATE/DELETE statements (the batch API, imports) when executed.
+@event.listens_for(db.session, 'after_flush')
+def _note_task_flush(session, flush_context):
+    if any(isinstance(obj, Task) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info['tasks_changed'] = True
+
+@event.listens_for(db.session, 'do_orm_execute')
+def _note_task_statement(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info['tasks_changed'] = True
+
+@event.listens_for(db.session, 'before_commit')
+def _invalidate_before_commit(session):
+    session.flush()  # commit() would only flush after this hook
+    if session.info.pop('tasks_changed', False):
+        invalidate_dashboard(session.connection())
+
+@event.listens_for(db.session, 'after_rollback')
+def _forget_rolled_back_changes(session):
+    session.info.pop('tasks_changed', None)
+
+def _cache_when_complete(key, chunks):
+    """Passes a streamed page through, caching it once it has been fully sent."""
+    rendered = []
+    for chunk in chunks:
+        rendered.append(chunk)
+        yield chunk
+    page_cache.set(key, ''.join(rendered))
 
 # --- Application Routes ---
-@app.route('/')
+@bp.route('/')
 def index():
-    """The main route, displays all tasks."""
-    tasks = Task.query.order_by(Task.id).all()
-    return render_template('index.html', tasks=tasks)
+    """The main route, streams one keyset-paginated page of tasks."""
+    # Out-of-range ids would only fail once the page had started streaming.
+    after = min(max(request.args.get('after', 0, type=int), 0), MAX_TASK_ID)
+    limit = request.args.get('limit', TASKS_PER_PAGE, type=int)
+    limit = min(max(limit, 1), MAX_TASKS_PER_PAGE)
+    version, modified = dashboard_version()
+    etag = f'{version}-{after}-{limit}'
+    last_modified = datetime.fromtimestamp(modified, timezone.utc)
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        cache_stats['not_modified'] += 1
+        response = current_app.response_class(status=304)
+    else:
+        key = f'index:{etag}'
+        cached = page_cache.get(key)
+        if cached is not None:
+            cache_stats['hit'] += 1
+            response = current_app.response_class(cached)
+        else:
+            cache_stats['miss'] += 1
+            page = TaskPage(after, limit)
+            response = current_app.response_class(_cache_when_complete(
+                key, stream_template('index.html', tasks=page, after=after, limit=limit)))
+        response.headers['X-Cache'] = 'HIT' if cached is not None else 'MISS'
+    # Browsers keep the page but revalidate it on every visit, getting a 304
+    # until the tasks change.
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    return response
 
-@app.route('/add', methods=['POST'])
+@bp.route('/add', methods=['POST'])
 def add_task():
     """Handles the form submission for adding a new task."""
     task_content = request.form['content']
     new_task = Task(content=task_content)
     db.session.add(new_task)
     db.session.commit()
-    return redirect(url_for('index'))
+    return redirect(url_for('tasks.index'))
 
-@app.route('/delete/<int:id>')
+@bp.route('/delete/<int:id>')
 def delete_task(id):
     """Deletes a task by its ID."""
     task_to_delete = Task.query.get_or_404(id)
     db.session.delete(task_to_delete)
     db.session.commit()
-    return redirect(url_for('index'))
+    if _wants_json():
+        return jsonify(id=id, deleted=True)
+    if _wants_fragment():
+        return '', 204
+    return redirect(url_for('tasks.index'))
 
-@app.route('/edit/<int:id>', methods=['GET', 'POST'])
+@bp.route('/edit/<int:id>', methods=['GET', 'POST'])
 def edit_task(id):
     """Handles both displaying the edit form (GET) and updating the task (POST)."""
     task = Task.query.get_or_404(id)
     if request.method == 'POST':
         task.content = request.form['content']
         db.session.commit()
-        return redirect(url_for('index'))
+        return redirect(url_for('tasks.index'))
     else:
         return render_template('edit.html', task=task)
 
-@app.route('/complete/<int:id>')
+@bp.route('/complete/<int:id>')
 def complete_task(id):
     """Toggles the 'completed' status of a task."""
     task = Task.query.get_or_404(id)
     task.completed = not task.completed
     db.session.commit()
-    return redirect(url_for('index'))
+    if _wants_json():
+        return jsonify(id=task.id, content=task.content, completed=task.completed)
+    if _wants_fragment():
+        return render_template('_task.html', task=task)
+    return redirect(url_for('tasks.index'))
+
+SEARCH_RESULTS_PER_PAGE = 20
+SEARCH_RANK_WINDOW = 2000
+
+def _ranked_search(match, limit, offset):
+    """Matching tasks from `offset` on: the newest SEARCH_RANK_WINDOW matches
+    best first, then every older match, newest first.
+
+    bm25 ranking has to score every match, so very common words would make it
+    slow on big tables. Only the newest matches are ranked: `threshold` is the
+    lowest rowid among them, which FTS5 turns into a cheap rowid range on its
+    index. Older matches are still reachable by paging on past the window.
+    """
+    matches = ('SELECT task.* FROM task_fts JOIN task ON task.id = task_fts.rowid'
+               ' WHERE task_fts MATCH :match')
+    threshold = db.session.execute(text(
+        'SELECT rowid FROM task_fts WHERE task_fts MATCH :match'
+        ' ORDER BY rowid DESC LIMIT 1 OFFSET :window'
+    ), {'match': match, 'window': SEARCH_RANK_WINDOW - 1}).scalar()
+    tasks = []
+    if offset < SEARCH_RANK_WINDOW:
+        tasks = db.session.scalars(db.select(Task).from_statement(text(
+            matches + ' AND task_fts.rowid >= :threshold'
+            ' ORDER BY task_fts.rank LIMIT :limit OFFSET :offset'
+        )), {'match': match, 'threshold': threshold or 0, 'limit': limit, 'offset': offset}).all()
+    if threshold is not None and len(tasks) < limit:
+        # The window holds exactly SEARCH_RANK_WINDOW matches, so the older
+        # ones continue where it ends.
+        tasks += db.session.scalars(db.select(Task).from_statement(text(
+            matches + ' AND task_fts.rowid < :threshold'
+            ' ORDER BY task_fts.rowid DESC LIMIT :limit OFFSET :offset'
+        )), {'match': match, 'threshold': threshold, 'limit': limit - len(tasks),
+             'offset': max(offset - SEARCH_RANK_WINDOW, 0)}).all()
+    return tasks
+
+@bp.route('/search')
+def search():
+    """Full-text search over task content, best matches first."""
+    query = request.args.get('q', '').strip()
+    page = max(request.args.get('page', 1, type=int), 1)
+    limit = min(max(request.args.get('limit', SEARCH_RESULTS_PER_PAGE, type=int), 1),
+                MAX_TASKS_PER_PAGE)
+    terms = search_terms(query)
+    tasks = []
+    if terms:
+        # One extra row is fetched only to find out whether another page exists.
+        window = {'limit': limit + 1, 'offset': (page - 1) * limit}
+        if search_index_supported():
+            tasks = _ranked_search(fts_match_expression(terms), **window)
+        else:
+            # Other databases have no task_fts; fall back to a substring filter.
+            tasks = Task.query.filter(
+                *[Task.content.ilike(f'%{term}%') for term in terms]
+            ).order_by(Task.id).limit(window['limit']).offset(window['offset']).all()
+    has_more = len(tasks) > limit
+    return render_template('search.html', tasks=tasks[:limit], query=query,
+                           page=page, limit=limit, has_more=has_more)
+
+# --- Batch JSON API ---
+# Importers and mobile clients sync many changes at once. Instead of one request,
+# lookup and commit per change, they POST a JSON array of operations here:
+#   {"op": "create", "content": "...", "completed": false}
+#   {"op": "update", "id": 1, "content": "...", "completed": true}
+#   {"op": "delete", "id": 1}
+# Valid operations are applied with bulk INSERT/UPDATE/DELETE statements in a
+# single transaction; invalid ones are skipped and reported in their result slot.
+MAX_BATCH_OPERATIONS = 1000
+
+def _is_task_id(value):
+    return (isinstance(value, int) and not isinstance(value, bool)
+            and -MAX_TASK_ID - 1 <= value <= MAX_TASK_ID)
+
+def _validate_fields(operation, require_content):
+    """Returns the task columns an operation sets, or raises ValueError."""
+    values = {}
+    if 'content' in operation or require_content:
+        content = operation.get('content')
+        if not isinstance(content, str) or not content.strip():
+            raise ValueError("'content' must be a non-empty string")
+        if len(content) > 200:
+            raise ValueError("'content' must be at most 200 characters")
+        values['content'] = content
+    if 'completed' in operation:
+        if not isinstance(operation['completed'], bool):
+            raise ValueError("'completed' must be a boolean")
+        values['completed'] = operation['completed']
+    return values
+
+@bp.route('/api/tasks/batch', methods=['POST'])
+def batch_tasks():
+    """Applies an array of create/update/delete operations in one transaction."""
+    operations = request.get_json(silent=True)
+    if not isinstance(operations, list):
+        return jsonify(error='Request body must be a JSON array of operations.'), 400
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        return jsonify(error=f'A batch may contain at most {MAX_BATCH_OPERATIONS} operations.'), 400
+
+    results = [None] * len(operations)
+    creates = []   # (position, row)
+    updates = {}   # id -> merged column values, in first-seen order
+    update_positions = []
+    delete_positions = {}  # id -> position of the first delete
+
+    # Every id the batch touches is checked with a single query up front.
+    referenced_ids = {op.get('id') for op in operations
+                      if isinstance(op, dict) and _is_task_id(op.get('id'))}
+    existing_ids = set()
+    if referenced_ids:
+        existing_ids = set(db.session.scalars(
+            db.select(Task.id).where(Task.id.in_(referenced_ids))))
+
+    for position, operation in enumerate(operations):
+        if not isinstance(operation, dict):
+            results[position] = {'status': 400, 'error': 'Operation must be a JSON object.'}
+            continue
+        kind = operation.get('op')
+        try:
+            if kind == 'create':
+                row = {'completed': False, **_validate_fields(operation, require_content=True)}
+                creates.append((position, row))
+                continue
+            if kind not in ('update', 'delete'):
+                raise ValueError("'op' must be one of 'create', 'update' or 'delete'")
+            task_id = operation.get('id')
+            if not _is_task_id(task_id):
+                raise ValueError("'id' must be a 32-bit integer")
+            if kind == 'update':
+                values = _validate_fields(operation, require_content=False)
+                if not values:
+                    raise ValueError("an update must set 'content' and/or 'completed'")
+        except ValueError as error:
+            results[position] = {'status': 400, 'error': str(error)}
+            continue
+
+        if task_id not in existing_ids or task_id in delete_positions:
+            results[position] = {'status': 404, 'id': task_id, 'error': 'Task not found.'}
+        elif kind == 'update':
+            updates.setdefault(task_id, {}).update(values)
+            update_positions.append((position, task_id))
+        else:
+            delete_positions[task_id] = position
+
+    # Updates to tasks deleted later in the same batch are simply superseded.
+    pending_updates = [{'id': task_id, **values} for task_id, values in updates.items()
+                       if task_id not in delete_positions]
+
+    if creates:
+        created_ids = db.session.scalars(
+            db.insert(Task).returning(Task.id, sort_by_parameter_order=True),
+            [row for _position, row in creates],
+        ).all()
+        for (position, _row), task_id in zip(creates, created_ids):
+            results[position] = {'status': 201, 'id': task_id}
+    if pending_updates:
+        # Bulk UPDATE by primary key; rows are grouped by the columns they set.
+        db.session.execute(db.update(Task), pending_updates)
+    if delete_positions:
+        db.session.execute(db.delete(Task).where(Task.id.in_(delete_positions)))
+    db.session.commit()
+
+    for position, task_id in update_positions:
+        results[position] = {'status': 200, 'id': task_id}
+    for task_id, position in delete_positions.items():
+        results[position] = {'status': 200, 'id': task_id}
+    return jsonify(results=results)
+
+# --- Request Metrics (opt-in) ---
+# With METRICS_ENABLED=1 every request records its latency, how many SQL
+# statements it ran and how long they took, and how long Jinja spent rendering.
+# The numbers are served from /metrics in the Prometheus text format. They are
+# kept per process, so each gunicorn worker reports its own share.
+#
+# PROFILE_SAMPLE_RATE (e.g. 0.01) additionally runs that fraction of requests
+# under cProfile; those slower than PROFILE_SLOW_MS are dumped to
+# instance/profiles/ for inspection with pstats or snakeviz.
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '').lower() in ('1', 'true', 'yes')
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+PROFILE_SLOW_MS = float(os.environ.get('PROFILE_SLOW_MS', 500))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100)
+
+class Histogram:
+    """Counts observations into cumulative Prometheus-style buckets."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+class RequestMetrics:
+    """Per-endpoint histograms, rendered in the Prometheus text format."""
+
+    SERIES = {
+        'request_duration_seconds': ('Time to serve a request, body included.', LATENCY_BUCKETS),
+        'request_sql_queries': ('SQL statements executed per request.', QUERY_COUNT_BUCKETS),
+        'request_sql_seconds': ('Time spent executing SQL per request.', LATENCY_BUCKETS),
+        'request_render_seconds': ('Time spent rendering templates per request, SQL excluded.',
+                                   LATENCY_BUCKETS),
+    }
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, endpoint, method, **values):
+        with self._lock:
+            for name, value in values.items():
+                key = (name, endpoint, method)
+                if key not in self._histograms:
+                    self._histograms[key] = Histogram(self.SERIES[name][1])
+                self._histograms[key].observe(value)
+
+    def render(self):
+        lines = []
+        with self._lock:
+            for name, (help_text, _buckets) in self.SERIES.items():
+                lines.append(f'# HELP zenith_{name} {help_text}')
+                lines.append(f'# TYPE zenith_{name} histogram')
+                for (series, endpoint, method), histogram in sorted(self._histograms.items()):
+                    if series != name:
+                        continue
+                    labels = f'endpoint="{endpoint}",method="{method}"'
+                    cumulative = 0
+                    for bound, count in zip((*histogram.buckets, '+Inf'), histogram.counts):
+                        cumulative += count
+                        lines.append(f'zenith_{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                    lines.append(f'zenith_{name}_sum{{{labels}}} {histogram.sum}')
+                    lines.append(f'zenith_{name}_count{{{labels}}} {cumulative}')
+        lines.append('# HELP zenith_page_cache_requests_total Dashboard requests by cache outcome.')
+        lines.append('# TYPE zenith_page_cache_requests_total counter')
+        for result, count in cache_stats.items():
+            lines.append(f'zenith_page_cache_requests_total{{result="{result}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+request_metrics = RequestMetrics()
+
+_profiler_lock = threading.Lock()
+
+def _start_request_metrics():
+    g.request_metrics = state = {
+        'started': time.perf_counter(), 'queries': 0, 'sql': 0.0, 'render': 0.0, 'profiler': None,
+    }
+    # Since Python 3.12 only one profiler can be active per interpreter, so a
+    # sampled request that overlaps another one's profile is just not profiled.
+    if (PROFILE_SAMPLE_RATE and random.random() < PROFILE_SAMPLE_RATE
+            and _profiler_lock.acquire(blocking=False)):
+        state['profiler'] = cProfile.Profile()
+        try:
+            state['profiler'].enable()
+        except ValueError:  # another profiling tool, e.g. a debugger, is active
+            state['profiler'] = None
+            _profiler_lock.release()
+
+def _finish_request_metrics(response):
+    state = g.get('request_metrics')
+    if state is None:
+        return response
+    endpoint, method = request.endpoint or 'unmatched', request.method
+    path = request.path
+    profile_path = os.path.join(current_app.instance_path, 'profiles')
+
+    # Streamed pages are still being rendered at this point, so the numbers are
+    # only recorded once the server has sent the whole body and closed it.
+    def record():
+        duration = time.perf_counter() - state['started']
+        request_metrics.observe(endpoint, method, request_duration_seconds=duration,
+                                request_sql_queries=state['queries'],
+                                request_sql_seconds=state['sql'],
+                                request_render_seconds=state['render'])
+        profiler = _stop_profiler(state)
+        if profiler is not None:
+            if duration * 1000 >= PROFILE_SLOW_MS:
+                os.makedirs(profile_path, exist_ok=True)
+                name = f"{endpoint}-{int(time.time() * 1000)}-{path.strip('/').replace('/', '_')}.prof"
+                profiler.dump_stats(os.path.join(profile_path, name))
+
+    state['recording'] = True
+    response.call_on_close(record)
+    return response
+
+def _stop_profiler(state):
+    """Disables the request's profiler, if any, and returns it."""
+    profiler, state['profiler'] = state['profiler'], None
+    if profiler is not None:
+        profiler.disable()
+        _profiler_lock.release()
+    return profiler
+
+def _abandon_request_metrics(exc):
+    # When an exception propagates (debug mode, TESTING), after_request is
+    # skipped and record() never runs; the profiler must not stay active.
+    state = g.get('request_metrics')
+    if state is not None and not state.get('recording'):
+        _stop_profiler(state)
+
+# The start time is kept on the statement's execution context, which is
+# discarded with it even when the statement fails.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_query_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_metrics_query_started', None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    state = g.get('request_metrics') if has_request_context() else None
+    if state is not None:
+        state['queries'] += 1
+        state['sql'] += elapsed
+
+def _template_render_started(sender, template, context, **extra):
+    state = g.get('request_metrics')
+    if state is not None:
+        state['render_started'] = (time.perf_counter(), state['sql'])
+
+def _template_render_finished(sender, template, context, **extra):
+    state = g.get('request_metrics')
+    if state is not None and 'render_started' in state:
+        started, sql_before = state.pop('render_started')
+        # Streamed pages run their queries while rendering; count those as SQL.
+        state['render'] += time.perf_counter() - started - (state['sql'] - sql_before)
+
+def metrics():
+    """Exposes the request metrics in the Prometheus text format."""
+    return request_metrics.render(), 200, {'Content-Type': 'text/plain; version=0.0.4'}
+
+def init_metrics(app):
+    app.before_request(_start_request_metrics)
+    app.after_request(_finish_request_metrics)
+    app.teardown_request(_abandon_request_metrics)
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    before_render_template.connect(_template_render_started, app)
+    template_rendered.connect(_template_render_finished, app)
+    app.add_url_rule('/metrics', view_func=metrics)
+
+# --- Custom CLI Commands ---
+@click.command(name='init-db')
+@with_appcontext
+def init_db_command():
+    """Creates the tables and the search index if they do not exist yet."""
+    bootstrap_database(current_app._get_current_object())
+    click.echo('Database initialized.')
 
-# --- Custom CLI Command (for local development only) ---
 @click.command(name='reset-db')
 @with_appcontext
 def reset_db_command():
     """A command-line helper to wipe and recreate the database during testing."""
+    drop_search_index()
     db.drop_all()
     db.create_all()
+    create_search_index()
+    with db.engine.begin() as connection:
+        invalidate_dashboard(connection)
     click.echo('Database wiped and reset.')
 
-app.cli.add_command(reset_db_command)
+@click.command(name='rebuild-search-index')
+@with_appcontext
+def rebuild_search_index_command():
+    """Rebuilds the full-text search index from the task table."""
+    if not search_index_supported():
+        raise click.ClickException('The full-text search index is only used with SQLite.')
+    create_search_index()
+    rebuild_search_index()
+    click.echo('Search index rebuilt.')
+
+# --- Bulk Import / Export ---
+# Both commands stream: export reads tasks in id order in batches, import reads
+# the file record by record and inserts a batch at a time, so memory stays flat
+# regardless of file size. JSONL records look like
+#   {"id": 1, "content": "Write report", "completed": false}
+# and CSV files have an "id,content,completed" header.
+EXPORT_FIELDS = ('id', 'content', 'completed')
+PROGRESS_EVERY = 100_000
+
+def _file_format(path, file_format):
+    if file_format:
+        return file_format
+    return 'csv' if path.lower().endswith('.csv') else 'jsonl'
+
+def _read_checkpoint(path, resume):
+    """Returns the numbers saved by an interrupted run on PATH, if resuming it."""
+    checkpoint = f'{path}.progress'
+    if not os.path.exists(checkpoint):
+        return None
+    with open(checkpoint) as progress:
+        saved = [int(number) for number in progress.read().split()]
+    if not resume:
+        raise click.ClickException(
+            f'A previous run on {path} was interrupted. Rerun with --resume to continue '
+            f'it, or delete {checkpoint} to start over.')
+    return saved
+
+def _write_checkpoint(path, *numbers):
+    with open(f'{path}.progress', 'w') as progress:
+        progress.write(' '.join(str(number) for number in numbers))
+
+@click.command(name='export-tasks')
+@click.argument('path')
+@click.option('--format', 'file_format', type=click.Choice(['jsonl', 'csv']),
+              help='Defaults to csv for *.csv paths and jsonl otherwise.')
+@click.option('--batch-size', default=5000, show_default=True, help='Rows fetched per round trip.')
+@click.option('--resume', is_flag=True, help='Continue an export that was interrupted.')
+@with_appcontext
+def export_tasks_command(path, file_format, batch_size, resume):
+    """Streams every task to PATH as JSONL or CSV ("-" for stdout).
+
+    After each batch the last exported id and the file size are recorded in
+    PATH.progress, so an interrupted export can be continued with --resume.
+    """
+    file_format = _file_format(path, file_format)
+    to_stdout = path == '-'
+    saved = None if to_stdout else _read_checkpoint(path, resume)
+    after = 0
+    if saved:
+        after, size = saved
+        output = open(path, 'r+', encoding='utf-8', newline='')
+        output.truncate(size)  # drop whatever was written after the last checkpoint
+        output.seek(size)
+        click.echo(f'Resuming after task {after}.', err=True)
+    else:
+        output = sys.stdout if to_stdout else open(path, 'w', encoding='utf-8', newline='')
+    writer = csv.writer(output) if file_format == 'csv' else None
+    if writer and not saved:
+        writer.writerow(EXPORT_FIELDS)
+
+    rows = db.session.execute(
+        db.select(Task.id, Task.content, Task.completed)
+        .where(Task.id > after).order_by(Task.id)
+        .execution_options(yield_per=batch_size))
+    exported, started = 0, time.perf_counter()
+    try:
+        for task_id, content, completed in rows:
+            if writer:
+                writer.writerow((task_id, content, int(bool(completed))))
+            else:
+                output.write(json.dumps({'id': task_id, 'content': content,
+                                         'completed': bool(completed)}, ensure_ascii=False) + '\n')
+            exported += 1
+            if exported % batch_size == 0 and not to_stdout:
+                output.flush()
+                _write_checkpoint(path, task_id, output.tell())
+            if exported % PROGRESS_EVERY == 0:
+                rate = exported / (time.perf_counter() - started)
+                click.echo(f'Exported {exported} tasks ({rate:.0f}/s)...', err=True)
+    finally:
+        rows.close()
+        if not to_stdout:
+            output.close()
+    if not to_stdout and os.path.exists(f'{path}.progress'):
+        os.remove(f'{path}.progress')
+    click.echo(f'Exported {exported} tasks in {time.perf_counter() - started:.1f}s.', err=True)
+
+def _read_records(path, file_format):
+    """Yields (record number, record) pairs from a JSONL or CSV file. JSONL
+    records are yielded unparsed, so that _task_row reports malformed lines."""
+    with (sys.stdin if path == '-' else open(path, encoding='utf-8', newline='')) as source:
+        if file_format == 'csv':
+            for number, record in enumerate(csv.DictReader(source), start=1):
+                yield number, record
+        else:
+            number = 0
+            for line in source:
+                if line.strip():
+                    number += 1
+                    yield number, line
+
+def _task_row(record, keep_ids):
+    """Returns the task columns for one record, or raises ValueError (or a
+    lookup/type error for records of the wrong shape)."""
+    if isinstance(record, str):
+        record = json.loads(record)
+    completed = record.get('completed', False)
+    if isinstance(completed, str):  # CSV values are always strings
+        completed = {'1': True, 'true': True, 'yes': True,
+                     '0': False, 'false': False, 'no': False, '': False,
+                     }.get(completed.strip().lower(), completed)
+    row = _validate_fields({'content': record.get('content'), 'completed': completed},
+                           require_content=True)
+    if keep_ids:
+        task_id = record['id']
+        if isinstance(task_id, str):
+            task_id = int(task_id)
+        if not _is_task_id(task_id):
+            raise ValueError("'id' must be a 32-bit integer")
+        row['id'] = task_id
+    return row
+
+def _invalid_record(number, error):
+    return click.ClickException(f'Record {number} is invalid ({error}); '
+                                f'fix it and rerun with --resume.')
+
+def _sync_id_sequence():
+    """Moves Postgres' id sequence past ids that were inserted explicitly."""
+    if db.engine.dialect.name == 'postgresql':
+        with db.engine.begin() as connection:
+            connection.execute(text(
+                "SELECT setval(pg_get_serial_sequence('task', 'id'),"
+                " coalesce(max(id), 1), max(id) IS NOT NULL) FROM task"))
+
+@click.command(name='import-tasks')
+@click.argument('path')
+@click.option('--format', 'file_format', type=click.Choice(['jsonl', 'csv']),
+              help='Defaults to csv for *.csv paths and jsonl otherwise.')
+@click.option('--batch-size', default=5000, show_default=True, help='Rows inserted per transaction.')
+@click.option('--keep-ids', is_flag=True, help='Keep the ids from the file instead of assigning new ones.')
+@click.option('--resume', is_flag=True, help='Skip the records a failed import already committed.')
+@with_appcontext
+def import_tasks_command(path, file_format, batch_size, keep_ids, resume):
+    """Loads tasks from a JSONL or CSV file at PATH ("-" for stdin).
+
+    Each batch is committed on its own and recorded in PATH.progress, so an
+    import that fails part-way can be continued with --resume.
+    """
+    bootstrap_database(current_app._get_current_object())
+    file_format = _file_format(path, file_format)
+    to_stdin = path == '-'
+    saved = None if to_stdin else _read_checkpoint(path, resume)
+    skip = saved[0] if saved else 0
+    if skip:
+        click.echo(f'Resuming after record {skip}.', err=True)
+
+    imported, started = skip, time.perf_counter()
+    batch = []  # (record number, row)
+
+    def commit(rows):
+        nonlocal imported
+        # A Core insert runs as a plain executemany, skipping ORM bookkeeping.
+        db.session.execute(Task.__table__.insert(), rows)
+        db.session.commit()
+        imported += len(rows)
+        if not to_stdin:
+            _write_checkpoint(path, imported)
+
+    def flush():
+        try:
+            commit([row for _number, row in batch])
+        except (DataError, IntegrityError):
+            # Find the record at fault (e.g. an id that --keep-ids found taken),
+            # committing the ones before it so that --resume starts from it.
+            db.session.rollback()
+            for position, (number, row) in enumerate(batch):
+                try:
+                    db.session.execute(Task.__table__.insert(), [row])
+                except (DataError, IntegrityError) as error:
+                    db.session.rollback()
+                    if position:
+                        commit([row for _number, row in batch[:position]])
+                    raise _invalid_record(number, error.orig)
+            raise
+        finally:
+            batch.clear()
+
+    suspend_search_index()
+    try:
+        for number, record in _read_records(path, file_format):
+            if number <= skip:
+                continue
+            try:
+                batch.append((number, _task_row(record, keep_ids)))
+            except (AttributeError, KeyError, TypeError, ValueError) as error:
+                if batch:
+                    flush()
+                raise _invalid_record(number, error)
+            if len(batch) >= batch_size:
+                flush()
+                if imported // PROGRESS_EVERY != (imported - batch_size) // PROGRESS_EVERY:
+                    rate = (imported - skip) / (time.perf_counter() - started)
+                    click.echo(f'Imported {imported} tasks ({rate:.0f}/s)...', err=True)
+        if batch:
+            flush()
+    finally:
+        db.session.rollback()
+        if keep_ids:
+            _sync_id_sequence()
+        click.echo('Updating the search index...', err=True)
+        create_search_index()
+    if not to_stdin and os.path.exists(f'{path}.progress'):
+        os.remove(f'{path}.progress')
+    click.echo(f'Imported {imported - skip} tasks in {time.perf_counter() - started:.1f}s.', err=True)
+
+# --- Application Factory ---
+def create_app(config=None):
+    """Builds and configures the Flask app. `config` overrides any setting."""
+    # Explicitly defining the template_folder is a robust practice for
+    # deployment environments like Render.
+    app = Flask(__name__, template_folder='templates')
+
+    # A secret key is required by Flask to handle sessions and flash messages securely.
+    app.config['SECRET_KEY'] = 'a-strong-and-random-secret-key' # In a real app, this should be a secure, random value.
+
+    # The database lives in Flask's dedicated 'instance' folder by default.
+    os.makedirs(app.instance_path, exist_ok=True) # Ensure the folder exists before the app starts.
+    # DATABASE_URL switches the app to another database, e.g. Postgres in production.
+    # Render hands out "postgres://" URLs, which SQLAlchemy only accepts as "postgresql://".
+    database_url = os.environ.get(
+        'DATABASE_URL', f"sqlite:///{os.path.join(app.instance_path, 'tasks.db')}")
+    if database_url.startswith('postgres://'):
+        database_url = database_url.replace('postgres://', 'postgresql://', 1)
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_url
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # Set DB_AUTO_BOOTSTRAP=0 when the schema is managed with `flask init-db`.
+    app.config['AUTO_BOOTSTRAP'] = os.environ.get('DB_AUTO_BOOTSTRAP', '1') != '0'
+    if config:
+        app.config.update(config)
+
+    # Server databases get a bounded, health-checked connection pool per worker.
+    # SQLite keeps Flask-SQLAlchemy's defaults, as its connections are just file handles.
+    if not app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+        app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {
+            'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),
+            'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+            'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+            'pool_pre_ping': True,
+        })
+
+    db.init_app(app)
+    app.register_blueprint(bp)
+    for command in (init_db_command, reset_db_command, rebuild_search_index_command,
+                    export_tasks_command, import_tasks_command):
+        app.cli.add_command(command)
+    if app.config['AUTO_BOOTSTRAP']:
+        app.before_request(_bootstrap_on_first_request)
+    if METRICS_ENABLED:
+        init_metrics(app)
+    return app
 
 # This block allows running the app directly with 'python app.py' for local testing.
 if __name__ == "__main__":
-    app.run(debug=True)
\ No newline at end of file
+    create_app().run(debug=True)
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""Benchmark task mutations: one request per change vs. the batch JSON API.
+
+Creates, toggles and deletes the same number of tasks through the classic
+routes (/add, /complete/<id>, /delete/<id>) and through /api/tasks/batch,
+against a throwaway on-disk SQLite database so commit/fsync costs are real.
+Redirects from the classic routes are not followed, which flatters them.
+
+    python benchmarks/bench_batch.py --operations 2000 --batch-size 500
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def per_route(client, count):
+    for n in range(count):
+        client.post('/add', data={'content': f'Task #{n}'})
+    ids = range(1, count + 1)
+    for task_id in ids:
+        client.get(f'/complete/{task_id}')
+    for task_id in ids:
+        client.get(f'/delete/{task_id}')
+
+
+def batched(client, count, batch_size):
+    def send(operations):
+        for start in range(0, len(operations), batch_size):
+            response = client.post('/api/tasks/batch', json=operations[start:start + batch_size])
+            assert response.status_code == 200, response.get_data(as_text=True)
+
+    created = []
+    for start in range(0, count, batch_size):
+        response = client.post('/api/tasks/batch', json=[
+            {'op': 'create', 'content': f'Task #{n}'}
+            for n in range(start, min(start + batch_size, count))
+        ])
+        created.extend(result['id'] for result in response.get_json()['results'])
+    send([{'op': 'update', 'id': task_id, 'completed': True} for task_id in created])
+    send([{'op': 'delete', 'id': task_id} for task_id in created])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--operations', type=int, default=2000,
+                        help='tasks to create, toggle and delete (3x this many changes)')
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        sys.path.insert(0, ROOT)
+        from app import create_app
+
+        app = create_app()
+        client = app.test_client()
+        runner = app.test_cli_runner()
+        changes = 3 * args.operations
+        for label, run in (('per-route', lambda: per_route(client, args.operations)),
+                           ('batch', lambda: batched(client, args.operations, args.batch_size))):
+            runner.invoke(args=['reset-db'])
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            print(f'{label:>9}: {changes} changes in {elapsed:7.2f} s'
+                  f' ({changes / elapsed:9.0f} changes/s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark concurrent writers: SQLite defaults vs. the app's tuned pragmas.
+
+Starts several worker processes, the way gunicorn would, that all add and
+toggle tasks through the app against one shared on-disk SQLite file. Runs
+once with SQLite's stock settings (rollback journal, synchronous=FULL) and
+once with the app's defaults (WAL, synchronous=NORMAL, mmap, larger cache).
+
+    python benchmarks/bench_concurrent_writes.py --workers 4 --writes 500
+"""
+import argparse
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# SQLite's own defaults, i.e. what the app ran with before it was tuned.
+STOCK_PRAGMAS = {
+    'SQLITE_JOURNAL_MODE': 'DELETE',
+    'SQLITE_SYNCHRONOUS': 'FULL',
+    'SQLITE_MMAP_SIZE': '0',
+    'SQLITE_CACHE_SIZE': '-2000',
+}
+
+
+def worker(environ, writes, start_event, errors):
+    os.environ.update(environ)
+    sys.path.insert(0, ROOT)
+    from app import create_app
+
+    client = create_app().test_client()
+    start_event.wait()
+    failed = 0
+    for n in range(writes):
+        if n % 2 == 0:
+            response = client.post('/add', data={'content': f'Task #{n}'})
+        else:
+            response = client.get(f'/complete/{n // 2 + 1}')
+        failed += response.status_code != 302
+    errors.put(failed)
+
+
+def run(label, environ, workers, writes):
+    with tempfile.TemporaryDirectory() as tmp:
+        environ = {**environ, 'DATABASE_URL': f"sqlite:///{os.path.join(tmp, 'bench.db')}"}
+        # Create the schema once, as a deployment would, before the workers start.
+        subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'init-db'], cwd=ROOT,
+                       check=True, capture_output=True, env={**os.environ, **environ})
+
+        ctx = multiprocessing.get_context('spawn')
+        start_event, errors = ctx.Event(), ctx.Queue()
+        processes = [ctx.Process(target=worker, args=(environ, writes, start_event, errors))
+                     for _ in range(workers)]
+        for process in processes:
+            process.start()
+        time.sleep(3)  # let every worker finish importing the app
+        start = time.perf_counter()
+        start_event.set()
+        failed = sum(errors.get() for _ in processes)
+        elapsed = time.perf_counter() - start
+        for process in processes:
+            process.join()
+
+    total = workers * writes
+    print(f'{label:>6}: {total} writes from {workers} processes in {elapsed:6.2f} s'
+          f' ({total / elapsed:7.0f} writes/s, {failed} failed)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--writes', type=int, default=500, help='writes per worker')
+    args = parser.parse_args()
+
+    run('stock', STOCK_PRAGMAS, args.workers, args.writes)
+    run('tuned', {}, args.workers, args.writes)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""Benchmark the import-tasks / export-tasks CLI commands.
+
+Writes a JSONL file of generated tasks, imports it into an empty throwaway
+SQLite database, then exports the table again as JSONL and as CSV, reporting
+rows per second and peak RSS (which should not grow with the row count).
+
+    python benchmarks/bench_import_export.py --tasks 1000000
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=1_000_000)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        sys.path.insert(0, ROOT)
+        from app import create_app
+
+        source = os.path.join(tmp, 'tasks.jsonl')
+        with open(source, 'w') as output:
+            for n in range(args.tasks):
+                output.write(json.dumps({'id': n + 1, 'content': f'Imported task #{n} for review',
+                                         'completed': n % 4 == 0}) + '\n')
+
+        runner = create_app().test_cli_runner()
+        steps = [
+            ('import jsonl', ['import-tasks', source]),
+            ('export jsonl', ['export-tasks', os.path.join(tmp, 'export.jsonl')]),
+            ('export csv', ['export-tasks', os.path.join(tmp, 'export.csv')]),
+        ]
+        for label, command in steps:
+            start = time.perf_counter()
+            result = runner.invoke(args=[*command, '--batch-size', str(args.batch_size)])
+            elapsed = time.perf_counter() - start
+            assert result.exit_code == 0, result.output
+            print(f'{label:>12}: {args.tasks} rows in {elapsed:6.2f} s ({args.tasks / elapsed:8.0f} rows/s)')
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f'Peak RSS of the whole run: {peak:.1f} MB')
+
+
+if __name__ == '__main__':
+    main()
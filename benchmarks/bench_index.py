@@ -0,0 +1,119 @@
+"""Benchmark the dashboard: full-table render vs. keyset-paginated streaming.
+
+Modes: "before" renders every task at once, "after" streams one page with the
+response cache disabled, and "cached" serves that page from the cache.
+Seeds a throwaway SQLite database and, for each mode, measures peak RSS and
+the time to the first byte / last byte of the index page. Every mode runs in
+its own subprocess so that peak RSS is not polluted by the previous run.
+
+    python benchmarks/bench_index.py --tasks 100000
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def peak_rss_mb():
+    """Peak RSS of this process; VmHWM is not inherited from the parent across exec."""
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def seed(database_url, count):
+    """Fills the benchmark database with `count` tasks."""
+    os.environ['DATABASE_URL'] = database_url
+    sys.path.insert(0, ROOT)
+    from app import create_app, bootstrap_database, db, Task
+
+    app = create_app()
+    bootstrap_database(app)
+    with app.app_context():
+        db.session.execute(
+            db.insert(Task),
+            [{'content': f'Benchmark task #{n}', 'completed': n % 3 == 0} for n in range(count)],
+        )
+        db.session.commit()
+
+
+def run_mode(mode, requests):
+    """Renders the dashboard `requests` times and reports timings as JSON."""
+    if mode != 'cached':
+        os.environ['CACHE_TTL'] = '0'
+    sys.path.insert(0, ROOT)
+    from flask import render_template
+    from app import create_app, Task
+
+    app = create_app()
+
+    def legacy_index():
+        # The original implementation: every row is loaded and rendered at once.
+        with app.test_request_context('/'):
+            tasks = Task.query.order_by(Task.id).all()
+            return [render_template('index.html', tasks=tasks)]
+
+    client = app.test_client()
+    first_byte, total = [], []
+    for _ in range(requests):
+        start = time.perf_counter()
+        if mode == 'before':
+            chunks = iter(legacy_index())
+        else:
+            response = client.get('/', buffered=False)
+            chunks = iter(response.response)
+        next(chunks)
+        first_byte.append(time.perf_counter() - start)
+        for _chunk in chunks:
+            pass
+        total.append(time.perf_counter() - start)
+
+    print(json.dumps({
+        'mode': mode,
+        'ttfb_ms': 1000 * sorted(first_byte)[len(first_byte) // 2],
+        'total_ms': 1000 * sorted(total)[len(total) // 2],
+        'peak_rss_mb': peak_rss_mb(),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=100_000)
+    parser.add_argument('--requests', type=int, default=5)
+    parser.add_argument('--mode', choices=['before', 'after', 'cached'], help=argparse.SUPPRESS)
+    parser.add_argument('--database-url', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        os.environ['DATABASE_URL'] = args.database_url
+        run_mode(args.mode, args.requests)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        seed(database_url, args.tasks)
+        print(f'Seeded {args.tasks} tasks; median of {args.requests} requests per mode.')
+        for mode in ('before', 'after', 'cached'):
+            output = subprocess.run(
+                [sys.executable, __file__, '--mode', mode, '--database-url', database_url,
+                 '--requests', str(args.requests)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{mode:>6}: TTFB {result['ttfb_ms']:9.2f} ms | total {result['total_ms']:9.2f} ms"
+                  f" | peak RSS {result['peak_rss_mb']:7.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark /search against a large task table.
+
+Seeds a throwaway SQLite database with random task descriptions (the FTS5
+index is filled by its triggers as rows go in), then times a mix of rare,
+common, multi-word and prefix queries through the app.
+
+    python benchmarks/bench_search.py --tasks 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# A few common words plus a long tail of rarer ones, drawn with Zipf-like
+# weights so that word frequencies look roughly like real text.
+COMMON = ('write review deploy fix refactor call email plan draft update test '
+          'report invoice meeting budget roadmap release bug customer design').split()
+WORDS = COMMON + [f'{prefix}{n}' for prefix in ('proj', 'client', 'team', 'item') for n in range(500)]
+WEIGHTS = [1 / rank for rank in range(1, len(WORDS) + 1)]
+QUERIES = ['write', 'invoice', 'customer release', 'client4', 'client42', 'bug fix report',
+           'zebra', 'proj499']
+CHUNK = 50_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        sys.path.insert(0, ROOT)
+        from app import create_app, bootstrap_database, db, Task
+
+        app = create_app()
+        bootstrap_database(app)
+
+        rng = random.Random(42)
+        start = time.perf_counter()
+        with app.app_context():
+            for offset in range(0, args.tasks, CHUNK):
+                rows = [{'content': ' '.join(rng.choices(WORDS, WEIGHTS, k=6)),
+                         'completed': False}
+                        for n in range(offset, min(offset + CHUNK, args.tasks))]
+                db.session.execute(db.insert(Task), rows)
+                db.session.commit()
+        print(f'Seeded {args.tasks} tasks in {time.perf_counter() - start:.1f} s;'
+              f' median of {args.repeat} requests per query.')
+
+        client = app.test_client()
+        client.get('/search', query_string={'q': 'warm up'})  # compile the templates
+        with app.app_context():
+            from app import fts_match_expression, search_terms
+            matches = {query: db.session.execute(
+                db.text('SELECT count(*) FROM task_fts WHERE task_fts MATCH :match'),
+                {'match': fts_match_expression(search_terms(query))}).scalar()
+                for query in QUERIES}
+        for query in QUERIES:
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                response = client.get('/search', query_string={'q': query})
+                timings.append(time.perf_counter() - started)
+                assert response.status_code == 200
+            print(f'{query!r:>18}: {1000 * sorted(timings)[len(timings) // 2]:8.2f} ms'
+                  f'  ({matches[query]} matching tasks)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""Benchmark cold start: import time, time to first request and worker memory.
+
+Measures, against a throwaway SQLite database:
+  * the cumulative import time of the app module (python -X importtime),
+  * a fresh process's time from start to its first served request, and
+  * how long gunicorn takes to answer its first request, plus the memory of
+    its master and workers.
+
+Pass --root to measure another checkout of the repo (e.g. an older commit
+added with `git worktree add`), so that the numbers can be compared.
+
+    python benchmarks/bench_startup.py --workers 4
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_REQUEST = '''
+import json, sys, time
+started = time.perf_counter()
+import app as module
+imported = time.perf_counter()
+app = module.create_app() if hasattr(module, 'create_app') else module.app
+response = app.test_client().get('/')
+assert response.status_code == 200, response.status_code
+response.close()
+done = time.perf_counter()
+with open('/proc/self/status') as status:
+    rss = next(int(line.split()[1]) for line in status if line.startswith('VmHWM:'))
+print(json.dumps({'import_ms': 1000 * (imported - started),
+                  'first_request_ms': 1000 * (done - started), 'peak_rss_mb': rss / 1024}))
+'''
+
+
+def import_time_ms(root, environ):
+    """Cumulative import time of the app module, as reported by -X importtime."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'], cwd=root,
+                            env=environ, capture_output=True, text=True, check=True)
+    for line in result.stderr.splitlines():
+        fields = [field.strip() for field in line.split('|')]
+        if len(fields) == 3 and fields[2] == 'app':
+            return int(fields[1]) / 1000
+    raise RuntimeError('app was not imported')
+
+
+def pss_mb(pid):
+    """Proportional set size: pages shared with the master after fork count
+    only partly, unlike in RSS."""
+    with open(f'/proc/{pid}/smaps_rollup') as rollup:
+        return next(int(line.split()[1]) for line in rollup if line.startswith('Pss:')) / 1024
+
+
+def gunicorn_boot(root, environ, workers):
+    """Seconds until gunicorn answers its first request, and PSS per process."""
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    target = 'app:create_app()' if os.path.exists(os.path.join(root, 'gunicorn.conf.py')) else 'app:app'
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{port}',
+         '--workers', str(workers), target],
+        cwd=root, env=environ, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while True:
+            try:
+                with urllib.request.urlopen(f'http://127.0.0.1:{port}/', timeout=1) as response:
+                    response.read()
+                break
+            except OSError:
+                if server.poll() is not None:
+                    raise RuntimeError('gunicorn exited during startup')
+                time.sleep(0.01)
+        elapsed = time.perf_counter() - started
+        time.sleep(1)  # let every worker finish booting before measuring memory
+        with open(f'/proc/{server.pid}/task/{server.pid}/children') as children:
+            worker_pids = [int(pid) for pid in children.read().split()]
+        return elapsed, pss_mb(server.pid), [pss_mb(pid) for pid in worker_pids]
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--root', default=ROOT, help='checkout of the app to measure')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        environ = {**os.environ, 'DATABASE_URL': f"sqlite:///{os.path.join(tmp, 'bench.db')}"}
+        # One untimed run creates the schema, as an existing deployment would have.
+        subprocess.run([sys.executable, '-c', FIRST_REQUEST], cwd=args.root, env=environ,
+                       capture_output=True, check=True)
+
+        imports = [import_time_ms(args.root, environ) for _ in range(args.repeat)]
+        print(f'import app (-X importtime): {statistics.median(imports):8.1f} ms')
+
+        runs = [json.loads(subprocess.run([sys.executable, '-c', FIRST_REQUEST], cwd=args.root,
+                                          env=environ, capture_output=True, text=True,
+                                          check=True).stdout)
+                for _ in range(args.repeat)]
+        for key, label in (('import_ms', 'import, wall clock'),
+                           ('first_request_ms', 'process start to first request')):
+            print(f'{label:>26}: {statistics.median(run[key] for run in runs):8.1f} ms')
+        print(f"{'peak RSS after it':>26}: {statistics.median(run['peak_rss_mb'] for run in runs):8.1f} MB")
+
+        try:
+            elapsed, master_pss, worker_pss = gunicorn_boot(args.root, environ, args.workers)
+        except (FileNotFoundError, RuntimeError) as error:
+            print(f'gunicorn: skipped ({error})')
+            return
+        print(f'gunicorn, {args.workers} workers: first response after {1000 * elapsed:.0f} ms;'
+              f' PSS master {master_pss:.1f} MB, workers '
+              + ', '.join(f'{pss:.1f}' for pss in worker_pss) + ' MB')
+
+
+if __name__ == '__main__':
+    main()
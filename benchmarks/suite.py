@@ -0,0 +1,328 @@
+"""Load-test every route and save the results for comparison across commits.
+
+Seeds a throwaway SQLite database with --tasks tasks, then replays the same
+deterministic requests against each route:
+
+  * in-process: the WSGI app is driven through Flask's test client, one route
+    per fresh process, so each route's peak RSS is its own;
+  * gunicorn: a real multi-worker server is started on a local port and
+    driven by --concurrency client threads (peak RSS is the largest worker's,
+    with each worker's high-water mark reset before every route).
+
+For each route it reports p50/p95/p99 latency, requests per second and peak
+memory, and writes everything to JSON (benchmarks/results/<commit>.json by
+default). Pass --compare with an earlier results file to print the changes.
+Everything runs locally; nothing needs network access.
+
+    python benchmarks/suite.py --tasks 10000 --requests 500
+    python benchmarks/suite.py --compare benchmarks/results/abc1234.json
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORDS = ('write review deploy fix refactor call email plan draft update test report '
+         'invoice meeting budget roadmap release bug customer design backup audit').split()
+WARMUP = 20
+
+
+def request_specs(route, count, tasks, seed=0):
+    """The (method, path, form data, JSON body, headers) of every request sent
+    to `route`. Ids are chosen so that every request targets an existing task:
+    deletes take the highest ids, everything else the lower half."""
+    rng = random.Random(f'{seed}-{route}')
+    lower = max(tasks // 2, 1)
+    fetch = {'X-Requested-With': 'fetch'}
+
+    def spec(n):
+        task_id = rng.randint(1, lower)
+        if route == 'index':
+            return 'GET', '/', None, None, {}
+        if route == 'index_page':
+            return 'GET', f'/?after={rng.randint(0, tasks)}', None, None, {}
+        if route == 'search':
+            return 'GET', '/search?q=' + '+'.join(rng.sample(WORDS, rng.randint(1, 2))), None, None, {}
+        if route == 'add_task':
+            return 'POST', '/add', {'content': f'Load test task {n}'}, None, {}
+        if route == 'edit_task_form':
+            return 'GET', f'/edit/{task_id}', None, None, {}
+        if route == 'edit_task':
+            return 'POST', f'/edit/{task_id}', {'content': f'Edited task {n}'}, None, {}
+        if route == 'complete_task':
+            return 'GET', f'/complete/{task_id}', None, None, {}
+        if route == 'complete_task_fetch':
+            return 'GET', f'/complete/{task_id}', None, None, fetch
+        if route == 'delete_task':
+            return 'GET', f'/delete/{tasks - n}', None, None, {}
+        if route == 'batch_tasks':
+            return 'POST', '/api/tasks/batch', None, [
+                {'op': 'update', 'id': rng.randint(1, lower), 'completed': rng.random() < 0.5}
+                for _ in range(25)
+            ] + [{'op': 'create', 'content': f'Batch task {n}-{i}'} for i in range(25)], {}
+        raise ValueError(route)
+
+    return [spec(n) for n in range(count)]
+
+
+# Read-only routes run first and deletes last, so every route sees the seeded data.
+ROUTES = ['index', 'index_page', 'search', 'edit_task_form', 'add_task', 'edit_task',
+          'complete_task', 'complete_task_fetch', 'batch_tasks', 'delete_task']
+
+
+def summarize(latencies, elapsed, errors, peak_rss_mb):
+    ordered = sorted(latencies)
+
+    def percentile(p):
+        return 1000 * ordered[min(int(p / 100 * len(ordered)), len(ordered) - 1)]
+
+    return {'requests': len(ordered), 'errors': errors,
+            'p50_ms': round(percentile(50), 3), 'p95_ms': round(percentile(95), 3),
+            'p99_ms': round(percentile(99), 3), 'rps': round(len(ordered) / elapsed, 1),
+            'peak_rss_mb': round(peak_rss_mb, 1)}
+
+
+def proc_status_mb(pid, field):
+    with open(f'/proc/{pid}/status') as status:
+        return next(int(line.split()[1]) for line in status if line.startswith(field)) / 1024
+
+
+def worker_pids(server):
+    with open(f'/proc/{server.pid}/task/{server.pid}/children') as children:
+        return [int(pid) for pid in children.read().split()]
+
+
+def reset_peak_rss(pid):
+    """Resets VmHWM to the current RSS (Linux 4.0+). Returns False if that is
+    not allowed, in which case the peak covers the process's whole life."""
+    try:
+        with open(f'/proc/{pid}/clear_refs', 'w') as clear_refs:
+            clear_refs.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def seed(tasks):
+    """Fills the database named by DATABASE_URL."""
+    sys.path.insert(0, ROOT)
+    from app import create_app, bootstrap_database, db, Task
+
+    app = create_app()
+    bootstrap_database(app)
+    rng = random.Random(42)
+    with app.app_context():
+        for offset in range(0, tasks, 10_000):
+            db.session.execute(db.insert(Task), [
+                {'content': ' '.join(rng.choices(WORDS, k=5)), 'completed': rng.random() < 0.3}
+                for _ in range(offset, min(offset + 10_000, tasks))
+            ])
+            db.session.commit()
+        db.engine.dispose()
+
+
+def copy_database(source, target):
+    with sqlite3.connect(source) as src, sqlite3.connect(target) as dst:
+        src.backup(dst)
+
+
+def run_route_in_process(route, count, tasks):
+    """Runs one route through the test client and prints its summary as JSON."""
+    sys.path.insert(0, ROOT)
+    from app import create_app
+
+    client = create_app().test_client()
+    specs = request_specs(route, WARMUP + count, tasks)
+    latencies, errors = [], 0
+    started = None
+    for n, (method, path, data, body, headers) in enumerate(specs):
+        if n == WARMUP:
+            started = time.perf_counter()
+        before = time.perf_counter()
+        response = client.open(path, method=method, data=data, json=body, headers=headers)
+        response.get_data()
+        response.close()
+        if n >= WARMUP:
+            latencies.append(time.perf_counter() - before)
+            errors += response.status_code >= 400
+    elapsed = time.perf_counter() - started
+    print(json.dumps(summarize(latencies, elapsed, errors, proc_status_mb('self', 'VmHWM:'))))
+
+
+def in_process(database, args):
+    results = {}
+    environ = {**os.environ, 'DATABASE_URL': f'sqlite:///{database}'}
+    for route in args.routes:
+        output = subprocess.run(
+            [sys.executable, __file__, '--run-route', route, '--requests', str(args.requests),
+             '--tasks', str(args.tasks)],
+            env=environ, check=True, capture_output=True, text=True).stdout
+        results[route] = {**json.loads(output.strip().splitlines()[-1]), 'peak_rss_scope': 'route'}
+        print_row('in-process', route, results[route])
+    return results
+
+
+def under_gunicorn(database, args):
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    environ = {**os.environ, 'DATABASE_URL': f'sqlite:///{database}'}
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{port}',
+         '--workers', str(args.workers)],
+        cwd=ROOT, env=environ, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def send(spec):
+        method, path, data, body, headers = spec
+        headers = dict(headers)
+        payload = None
+        if data is not None:
+            payload = '&'.join(f'{key}={value.replace(" ", "+")}' for key, value in data.items())
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        elif body is not None:
+            payload = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+        before = time.perf_counter()
+        # gunicorn's sync workers close every connection, so each request opens one.
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        connection.request(method, path, payload, headers)
+        response = connection.getresponse()
+        response.read()
+        connection.close()
+        return time.perf_counter() - before, response.status >= 400
+
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                send(('GET', '/', None, None, {}))
+                break
+            except OSError:
+                if server.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError('gunicorn did not start')
+                time.sleep(0.05)
+
+        results = {}
+        with ThreadPoolExecutor(args.concurrency) as pool:
+            for route in args.routes:
+                specs = request_specs(route, WARMUP + args.requests, args.tasks)
+                list(pool.map(send, specs[:WARMUP]))
+                per_route = all([reset_peak_rss(pid) for pid in worker_pids(server)])
+                started = time.perf_counter()
+                outcomes = list(pool.map(send, specs[WARMUP:]))
+                elapsed = time.perf_counter() - started
+                peak = max(proc_status_mb(pid, 'VmHWM:') for pid in worker_pids(server))
+                results[route] = summarize([latency for latency, _ in outcomes], elapsed,
+                                           sum(failed for _, failed in outcomes), peak)
+                results[route]['peak_rss_scope'] = 'route' if per_route else 'cumulative'
+                if not per_route:
+                    print('Could not reset the workers\' peak RSS; it covers every route so far.')
+                print_row('gunicorn', route, results[route])
+        return results
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def print_row(mode, route, result):
+    print(f"{mode:>10} {route:>20}: p50 {result['p50_ms']:8.2f} ms | p95 {result['p95_ms']:8.2f} ms"
+          f" | p99 {result['p99_ms']:8.2f} ms | {result['rps']:8.1f} req/s"
+          f" | {result['peak_rss_mb']:6.1f} MB | {result['errors']} errors")
+
+
+def compare(previous, current):
+    print(f"\nChange vs {previous.get('commit', '?')[:12]} (negative latency / positive req/s is better):")
+    for mode, routes in current['results'].items():
+        for route, result in routes.items():
+            old = previous.get('results', {}).get(mode, {}).get(route)
+            if not old:
+                continue
+            deltas = []
+            for key in ('p50_ms', 'p95_ms', 'p99_ms', 'rps', 'peak_rss_mb'):
+                if old[key]:
+                    deltas.append(f'{key} {100 * (result[key] - old[key]) / old[key]:+6.1f}%')
+            print(f'{mode:>10} {route:>20}: ' + ' | '.join(deltas))
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=10_000, help='size of the seeded table')
+    parser.add_argument('--requests', type=int, default=500, help='measured requests per route')
+    parser.add_argument('--mode', choices=['in-process', 'gunicorn', 'both'], default='both')
+    parser.add_argument('--workers', type=int, default=4, help='gunicorn workers')
+    parser.add_argument('--concurrency', type=int, default=8, help='client threads for gunicorn')
+    parser.add_argument('--routes', nargs='+', choices=ROUTES, default=ROUTES)
+    parser.add_argument('--output', help='defaults to benchmarks/results/<commit>.json')
+    parser.add_argument('--compare', help='earlier results file to compare against')
+    parser.add_argument('--run-route', choices=ROUTES, help=argparse.SUPPRESS)
+    parser.add_argument('--seed', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.seed:
+        seed(args.tasks)
+        return
+
+    if args.run_route:
+        run_route_in_process(args.run_route, args.requests, args.tasks)
+        return
+    if args.requests + WARMUP >= args.tasks // 2:
+        parser.error('--tasks must be more than twice --requests plus the warm-up requests')
+    args.routes = [route for route in ROUTES if route in args.routes]
+
+    commit = git_commit()
+    report = {
+        'commit': commit,
+        'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'config': {key: getattr(args, key) for key in
+                   ('tasks', 'requests', 'workers', 'concurrency', 'routes')},
+        'environment': {key: value for key, value in os.environ.items()
+                        if key.startswith(('SQLITE_', 'CACHE_', 'METRICS_', 'DB_'))},
+        'results': {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        seeded = os.path.join(tmp, 'seed.db')
+        os.environ['DATABASE_URL'] = f'sqlite:///{seeded}'
+        started = time.perf_counter()
+        subprocess.run([sys.executable, __file__, '--seed', '--tasks', str(args.tasks)], check=True)
+        print(f'Seeded {args.tasks} tasks in {time.perf_counter() - started:.1f} s;'
+              f' {args.requests} measured requests per route.')
+
+        modes = ['in-process', 'gunicorn'] if args.mode == 'both' else [args.mode]
+        for mode in modes:
+            database = os.path.join(tmp, f'{mode}.db')
+            copy_database(seeded, database)
+            if mode == 'in-process':
+                report['results'][mode] = in_process(database, args)
+            else:
+                report['results'][mode] = under_gunicorn(database, args)
+
+    output = args.output or os.path.join(ROOT, 'benchmarks', 'results', f'{commit[:12]}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as results_file:
+        json.dump(report, results_file, indent=2)
+    print(f'Results saved to {output}')
+    if args.compare:
+        with open(args.compare) as previous:
+            compare(json.load(previous), report)
+
+
+if __name__ == '__main__':
+    main()
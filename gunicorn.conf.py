@@ -0,0 +1,20 @@
+# Gunicorn reads this file automatically from the working directory.
+import os
+
+wsgi_app = 'app:create_app()'
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+
+# Import and build the app once in the master; workers are forked from it and
+# share its memory pages instead of each importing everything again.
+preload_app = True
+
+def when_ready(server):
+    """Creates the schema once, in the master, before any worker is forked."""
+    from app import bootstrap_database, db
+
+    app = server.app.wsgi()
+    bootstrap_database(app)
+    # Connections must never be shared across a fork; workers open their own.
+    with app.app_context():
+        db.engine.dispose()